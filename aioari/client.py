@@ -5,19 +5,31 @@
 """Async ARI client library.
 """
 
-import json
 import urllib
 import aiohttp
 import aioswagger11.client
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 from aioari.model import *
 
 log = logging.getLogger(__name__)
 
+#: WebSocket message types which end the event stream
+WS_CLOSE_TYPES = frozenset((aiohttp.WSMsgType.CLOSED,
+                            aiohttp.WSMsgType.CLOSING))
+
 
 class Client(object):
     """Async ARI Client object.
 
+    WebSocket events are decoded with self.json_loads, which defaults to
+    orjson.loads (or json.loads without orjson). Any callable turning a
+    frame into a dict will do, e.g. msgspec.json.Decoder().decode.
+
     :param base_url: Base URL for accessing Asterisk.
     :param http_client: HTTP client interface.
     """
@@ -26,6 +38,7 @@ class Client(object):
         url = urllib.parse.urljoin(base_url, "ari/api-docs/resources.json")
         self.swagger = aioswagger11.client.SwaggerClient(
             http_client=http_client, url=url)
+        self.json_loads = json_loads
 
     async def init(self):
         await self.swagger.init()
@@ -82,6 +95,7 @@ class Client(object):
 
         :param ws: WebSocket to drain.
         """
+        process = self.__process
         # TypeChecker false positive on iter(callable, sentinel) -> iterator
         # Fixed in plugin v3.0.1
         # noinspection PyTypeChecker
@@ -89,32 +103,40 @@ class Client(object):
             msg = await ws.receive()
             if msg is None:
                 return ## EOF
-            elif msg.type in {aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSING}:
-                break
-            elif msg.type != aiohttp.WSMsgType.TEXT:
+            msg_type = msg.type
+            if msg_type in WS_CLOSE_TYPES:
+                return
+            elif msg_type != aiohttp.WSMsgType.TEXT:
                 log.warning("Unknown JSON message type: %s", repr(msg))
                 continue # ignore
-            msg_json = json.loads(msg.data)
-            if not isinstance(msg_json, dict) or 'type' not in msg_json:
-                log.error("Invalid event: %s" % msg)
-                continue
-
-            listeners = list(self.event_listeners.get(msg_json['type'], [])) \
-                      + list(self.event_listeners.get('*', []))
-            for listener in listeners:
-                # noinspection PyBroadException
-                try:
-                    callback, args, kwargs = listener
-                    log.debug("cb_type=%s" % type(callback))
-                    args = args or ()
-                    kwargs = kwargs or {}
-                    cb = callback(msg_json, *args, **kwargs)
-                    # The callback may or may not be an async function
-                    if hasattr(cb,'__await__'):
-                        await cb
-
-                except Exception as e:
-                    self.exception_handler(e)
+            await process(msg)
+
+    async def __process(self, msg):
+        """Decode a single text message and send it to the client's listeners.
+
+        :param msg: WebSocket message.
+        """
+        msg_json = self.json_loads(msg.data)
+        if not isinstance(msg_json, dict) or 'type' not in msg_json:
+            log.error("Invalid event: %s", msg)
+            return
+
+        # Snapshot, since callbacks may unsubscribe while we iterate
+        get_listeners = self.event_listeners.get
+        listeners = [*get_listeners(msg_json['type'], ()),
+                     *get_listeners('*', ())]
+        for listener in listeners:
+            # noinspection PyBroadException
+            try:
+                callback, args, kwargs = listener
+                log.debug("cb_type=%s", type(callback))
+                cb = callback(msg_json, *args, **kwargs)
+                # The callback may or may not be an async function
+                if hasattr(cb,'__await__'):
+                    await cb
+
+            except Exception as e:
+                self.exception_handler(e)
 
     async def run(self, apps, *, _test_msgs=[]):
         """Connect to the WebSocket and begin processing messages.
@@ -149,11 +171,9 @@ class Client(object):
         :param kwargs: Keyword arguments to pass to event_cb
         """
         listeners = self.event_listeners.setdefault(event_type, list())
-        for cb in listeners:
-            if event_cb == cb[0]:
-                listeners.remove(cb)
+        listeners[:] = [cb for cb in listeners if cb[0] != event_cb]
         callback_obj = (event_cb, args, kwargs)
-        log.debug("event_cb=%s" % event_cb)
+        log.debug("event_cb=%s", event_cb)
         listeners.append(callback_obj)
         client = self
 
@@ -164,8 +184,13 @@ class Client(object):
             def close(self):
                 """Unsubscribe the associated event callback.
                 """
-                if callback_obj in client.event_listeners[event_type]:
-                    client.event_listeners[event_type].remove(callback_obj)
+                # By identity: an equal (cb, args, kwargs) registered later
+                # must stay subscribed
+                listeners = client.event_listeners[event_type]
+                for i, listener in enumerate(listeners):
+                    if listener is callback_obj:
+                        del listeners[i]
+                        break
 
         return EventUnsubscriber()
 
@@ -186,7 +211,8 @@ class Client(object):
         :param kwargs: Keyword arguments to pass to event_cb
         """
         # Find the associated model from the Swagger declaration
-        log.debug("On object event %s %s %s %s"%(event_type, event_cb, factory_fn, model_id))
+        log.debug("On object event %s %s %s %s",
+                  event_type, event_cb, factory_fn, model_id)
         event_model = self.event_models.get(event_type)
         if not event_model:
             raise ValueError("Cannot find event model '%s'" % event_type)
@@ -392,7 +392,7 @@ async def promote(client, resp, operation_json):
         return factory(client, resp_json)
     if resp.status == HTTPNoContent.status_code:
         return None
-    log.info("No mapping for %s; returning JSON" % response_class)
+    log.info("No mapping for %s; returning JSON", response_class)
     return json.loads(res)
 
 
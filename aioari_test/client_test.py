@@ -1,26 +1,23 @@
 #!/usr/bin/env python
 
 import aioari
-from aiohttp import web_exceptions
-import httpretty
-import json
+from aiohttp import hdrs, web_exceptions
 import pytest
-from urllib.request import urlopen
 
 from aioari_test.utils import AriTestCase
 
 
-GET = httpretty.GET
-PUT = httpretty.PUT
-POST = httpretty.POST
-DELETE = httpretty.DELETE
+GET = hdrs.METH_GET
+PUT = hdrs.METH_PUT
+POST = hdrs.METH_POST
+DELETE = hdrs.METH_DELETE
 
 
 # noinspection PyDocstring
-@pytest.mark.usefixtures("httpretty")
+@pytest.mark.usefixtures("ari_server")
 class TestClient(AriTestCase):
     def setUp(self, event_loop):
-        """Setup httpretty; create ARI client.
+        """Setup mock server; create ARI client.
         """
         super().setUp(event_loop)
         self.uut = event_loop.run_until_complete(aioari.connect('http://ari.py/', 'test', 'test'))
@@ -32,12 +29,13 @@ class TestClient(AriTestCase):
 
     @pytest.mark.asyncio
     async def test_docs(self):
-        fp = urlopen("http://ari.py/ari/api-docs/resources.json")
+        resp = await self.uut.swagger.http_client.request(
+            GET, "http://ari.py/ari/api-docs/resources.json")
         try:
-            actual = json.load(fp)
+            actual = await resp.json()
             assert self.BASE_URL == actual['basePath']
         finally:
-            fp.close()
+            resp.close()
 
     @pytest.mark.asyncio
     async def test_empty_listing(self):
@@ -1,19 +1,42 @@
 #!/usr/bin/env python
 
-import httpretty as htpr
+import asyncio
 import pytest
+from aioresponses import aioresponses
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 
 @pytest.fixture
-def httpretty(request, event_loop):
-    """Setup httpretty; create ARI client.
-        """
-    #super(AriTestCase, self).setUp()
-    htpr.enable()
-    request.instance.setUp(event_loop)
-
-    yield 123
-
-    request.instance.tearDown(event_loop)
-    htpr.disable()
-    htpr.reset()
+def event_loop():
+    """Create the event loop for a test; uvloop's if it is installed.
+
+    On Python 3.12+ tasks are started eagerly, so coroutines that finish
+    without blocking (as most do against the stubs) skip the scheduler.
+    """
+    if uvloop is not None:
+        loop = uvloop.new_event_loop()
+    else:
+        loop = asyncio.new_event_loop()
+    if hasattr(asyncio, 'eager_task_factory'):
+        loop.set_task_factory(asyncio.eager_task_factory)
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def ari_server(request, event_loop):
+    """Mock the ARI server's HTTP API; create ARI client.
+    """
+    # pytest-asyncio may have swapped the test method out by teardown
+    instance = request.instance
+    with aioresponses() as mock:
+        instance.mock = mock
+        instance.setUp(event_loop)
+
+        yield mock
+
+        instance.tearDown(event_loop)
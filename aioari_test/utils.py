@@ -1,11 +1,30 @@
 #!/usr/bin/env python
 
-import httpretty
+import functools
 import os
+import re
 from urllib import parse as urlparse
 import aioari
 
-from aiohttp.web_exceptions import HTTPNoContent
+from aiohttp import hdrs
+from aiohttp.web_exceptions import HTTPNoContent, HTTPNotFound
+from aioresponses import CallbackResult
+from yarl import URL
+
+@functools.lru_cache(maxsize=None)
+def load_api_docs():
+    """Read the sample api-docs once per test session.
+
+    :return: (filename, body) pairs.
+    :rtype:  tuple of (str, str)
+    """
+    docs = []
+    for filename in sorted(os.listdir('sample-api')):
+        if filename.endswith('.json'):
+            with open(os.path.join('sample-api', filename)) as fp:
+                docs.append((filename, fp.read()))
+    return tuple(docs)
+
 
 class AriTestCase:
     """Base class for mock async ARI server.
@@ -14,8 +33,10 @@ class AriTestCase:
     BASE_URL = "http://ari.py/ari"
 
     def setUp(self, event_loop):
-        """Setup httpretty; create ARI client.
+        """Serve the API docs; create ARI client.
         """
+        # {method: {path: response}}, see serve()
+        self.routes = {}
         self.serve_api()
 
     def tearDown(self, event_loop):
@@ -39,24 +60,40 @@ class AriTestCase:
         return url
 
     def serve_api(self):
-        """Register all api-docs with httpretty to serve them for unit tests.
+        """Register all api-docs with the mock to serve them for unit tests.
         """
-        for filename in os.listdir('sample-api'):
-            if filename.endswith('.json'):
-                with open(os.path.join('sample-api', filename)) as fp:
-                    body = fp.read()
-                self.serve(httpretty.GET, 'api-docs', filename, body=body)
+        for filename, body in load_api_docs():
+            self.serve(hdrs.METH_GET, 'api-docs', filename, body=body)
 
     def serve(self, method, *args, **kwargs):
         """Serve a single URL for current test.
 
-        :param method: HTTP method. httpretty.{GET,PUT,POST,DELETE}.
+        Each method gets one catch-all mock, which looks the request's path
+        up in self.routes; unknown paths get a 404.
+
+        :param method: HTTP method. aiohttp.hdrs.METH_{GET,PUT,POST,DELETE}.
         :param args: URL path segments.
-        :param kwargs: See httpretty.register_uri()
+        :param kwargs: See aioresponses.CallbackResult()
         """
         url = self.build_url(*args)
         if kwargs.get('body') is None and 'status' not in kwargs:
             kwargs['status'] = HTTPNoContent.status_code
-        httpretty.register_uri(method, url,
-                               content_type="application/json",
-                               **kwargs)
+        body = kwargs.pop('body', None) or b''
+        if isinstance(body, str):
+            body = body.encode()
+
+        routes = self.routes.get(method)
+        if routes is None:
+            routes = self.routes[method] = {}
+            not_found = CallbackResult(method=method,
+                                       status=HTTPNotFound.status_code)
+
+            def respond(url, **kwargs):
+                return routes.get(url.path, not_found)
+
+            # Any query string matches, e.g. the api_key added by the client
+            self.mock.add(re.compile(re.escape(self.BASE_URL + '/')), method,
+                          repeat=True, callback=respond)
+        routes[URL(url).path] = CallbackResult(
+            method=method, body=body, content_type="application/json",
+            **kwargs)
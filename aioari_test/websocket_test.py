@@ -6,22 +6,33 @@
 import pytest
 import aioari
 import aiohttp
-import asyncio
-import httpretty
+import json
 
+from aiohttp import hdrs
+from collections import deque
 from aioari_test.utils import AriTestCase
 from aioswagger11.http_client import AsynchronousHttpClient
 
 BASE_URL = "http://ari.py/ari"
 
-GET = httpretty.GET
-PUT = httpretty.PUT
-POST = httpretty.POST
-DELETE = httpretty.DELETE
+GET = hdrs.METH_GET
+PUT = hdrs.METH_PUT
+POST = hdrs.METH_POST
+DELETE = hdrs.METH_DELETE
+
+SERIES_EVENTS = [
+    {"type": "ev", "data": 1},
+    {"type": "ev", "data": 2},
+    {"type": "not_ev", "data": 3},
+    {"type": "not_ev", "data": 5},
+    {"type": "ev", "data": 9}
+]
+SERIES_MESSAGES = [json.dumps(ev) for ev in SERIES_EVENTS]
+SERIES_EXPECTED = [ev for ev in SERIES_EVENTS if ev["type"] == "ev"]
 
 
 # noinspection PyDocstring
-@pytest.mark.usefixtures("httpretty")
+@pytest.mark.usefixtures("ari_server")
 class TestWebSocket(AriTestCase):
     def setUp(self, event_loop):
         super(TestWebSocket, self).setUp(event_loop)
@@ -43,22 +54,40 @@ class TestWebSocket(AriTestCase):
 
     @pytest.mark.asyncio
     async def test_series(self, event_loop):
+        self.uut.on_event("ev", self.record_event)
+        await self.uut.run('test', _test_msgs=SERIES_MESSAGES)
+
+        assert self.actual == SERIES_EXPECTED
+
+    @pytest.mark.asyncio
+    async def test_close_from_listener(self, event_loop):
         messages = [
             '{"type": "ev", "data": 1}',
             '{"type": "ev", "data": 2}',
-            '{"type": "not_ev", "data": 3}',
-            '{"type": "not_ev", "data": 5}',
-            '{"type": "ev", "data": 9}'
+            '{"type": "ev", "data": 3}'
         ]
-        self.uut.on_event("ev", self.record_event)
+
+        async def close_on_first(event):
+            self.record_event(event)
+            await self.uut.close()
+
+        self.uut.on_event("ev", close_on_first)
         await self.uut.run('test', _test_msgs=messages)
 
-        expected = [
-            {"type": "ev", "data": 1},
-            {"type": "ev", "data": 2},
-            {"type": "ev", "data": 9}
-        ]
-        assert self.actual == expected
+        assert self.actual == [{"type": "ev", "data": 1}]
+
+    @pytest.mark.asyncio
+    async def test_custom_json_loads(self, event_loop):
+        def loads(data):
+            event = json.loads(data)
+            event["decoded"] = True
+            return event
+
+        self.uut.json_loads = loads
+        self.uut.on_event("ev", self.record_event)
+        await self.uut.run('test', _test_msgs=['{"type": "ev", "data": 1}'])
+
+        assert self.actual == [{"type": "ev", "data": 1, "decoded": True}]
 
     @pytest.mark.asyncio
     async def test_unsubscribe(self, event_loop):
@@ -87,6 +116,18 @@ class TestWebSocket(AriTestCase):
         assert self.actual == expected
         assert self.once_ran == 1
 
+    @pytest.mark.asyncio
+    async def test_resubscribe(self, event_loop):
+        messages = [
+            '{"type": "ev", "data": 1}'
+        ]
+        first = self.uut.on_event("ev", self.record_event)
+        self.uut.on_event("ev", self.record_event)
+        first.close()
+        await self.uut.run('test', _test_msgs=messages)
+
+        assert self.actual == [{"type": "ev", "data": 1}]
+
     @pytest.mark.asyncio
     async def test_on_channel(self, event_loop):
         self.serve(DELETE, 'channels', 'test-channel')
@@ -204,52 +245,55 @@ class TestWebSocket(AriTestCase):
         self.fail("Noop unexpectedly called")
 
 class FakeMsg:
-    def __init__(self,data):
+    __slots__ = ('data', 'type')
+
+    def __init__(self, data, type=aiohttp.WSMsgType.TEXT):
         self.data = data
-        self.type = aiohttp.WSMsgType.TEXT
+        self.type = type
+
+
+#: What aiohttp's receive() returns once the WebSocket is closed
+CLOSED_MSG = FakeMsg(None, aiohttp.WSMsgType.CLOSED)
+
 
 class WebSocketStubConnection(object):
     """Stub WebSocket connection.
 
-    :param messages:
+    Like aiohttp's WebSocket, this returns a CLOSED message once all frames
+    have been read or the connection has been closed.
+
+    :param messages: Frames to return from receive().
+    :type  messages: tuple of FakeMsg
     """
 
-    def __init__(self, messages, loop=None):
-        self.q = asyncio.Queue(loop=loop)
-        for m in messages:
-            self.q.put_nowait(m)
+    __slots__ = ('messages',)
+
+    def __init__(self, messages):
+        self.messages = deque(messages)
 
     async def receive(self):
         """Fake receive method
 
-        :return: Next message, or None if no more messages.
+        :return: Next message, or CLOSED_MSG if no more messages.
         """
-        if self.q is None:
-            return None
-        try:
-            msg = self.q.get_nowait()
-        except asyncio.QueueEmpty:
-            msg = None
-        if msg is None:
-            self.q = None
-        if msg is not None:
-            msg = FakeMsg(msg)
-        return msg
+        messages = self.messages
+        if messages:
+            return messages.popleft()
+        self.messages = None
+        return CLOSED_MSG
 
     def push(self, msg):
-        self.q.put_nowait(msg)
+        self.messages.append(FakeMsg(msg))
 
     async def send_close(self):
         """Fake send_close method
         """
-        if self.q is not None:
-            self.q.put(None)
+        self.messages = None
 
     async def close(self):
         """Fake close method
         """
-        if self.q is not None:
-            self.q.put(None)
+        self.messages = None
 
 
 class WebSocketStubClient(AsynchronousHttpClient):
@@ -261,19 +305,20 @@ class WebSocketStubClient(AsynchronousHttpClient):
 
     def __init__(self, messages, loop=None):
         super(WebSocketStubClient, self).__init__("fake_user","fake_pass", loop=loop)
-        self.messages = messages
+        # Wrap the frames once; every connection shares them
+        self.messages = tuple(FakeMsg(m) for m in messages)
 
     async def ws_connect(self, url, params=None):
         """Fake connect method.
 
         Returns a WebSocketStubConnection, which itself returns the series of
-        messages from WebSocketStubClient in its recv() method.
+        messages from WebSocketStubClient in its receive() method.
 
         :param url: Ignored.
         :param params: Ignored.
         :return: Stub connection.
         """
-        return WebSocketStubConnection(self.messages, self.session._loop)
+        return WebSocketStubConnection(self.messages)
 
 
 def raise_exceptions(ex):
@@ -281,7 +326,7 @@ def raise_exceptions(ex):
 
     :param ex: Exception caught by the event loop.
     """
-    raise
+    raise ex
 
 
 async def connect(base_url, messages, loop=None):
@@ -30,6 +30,7 @@ setup(
         "Programming Language :: Python :: 3.5",
         "Programming Language :: Python :: 3.6",
     ],
-    tests_require=["coverage", "httpretty", "pytest"],
+    tests_require=["aioresponses", "coverage", "pytest", "pytest-asyncio"],
     install_requires=["aioswagger11"],
+    extras_require={"orjson": ["orjson"], "uvloop": ["uvloop"]},
 )